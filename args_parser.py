@@ -40,7 +40,7 @@ Examples:
         parser.add_argument(
             '--output', '-o',
             default='settlements.xlsx',
-            help='Output file path (default: settlements.xlsx)'
+            help='Output file path, .xlsx or .csv (default: settlements.xlsx)'
         )
 
         parser.add_argument(
@@ -83,8 +83,8 @@ Examples:
         if not args.file.lower().endswith(('.xlsx', '.xls')):
             print("Warning: Input file should be an Excel file (.xlsx or .xls)")
 
-        if not args.output.lower().endswith(('.xlsx', '.xls')):
-            print("Warning: Output file should be an Excel file (.xlsx or .xls)")
+        if not args.output.lower().endswith(('.xlsx', '.xls', '.csv')):
+            print("Warning: Output file should be an Excel file (.xlsx or .xls) or a CSV file (.csv)")
 
 
 def get_arguments():
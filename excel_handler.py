@@ -2,9 +2,25 @@
 Excel file handling operations for expense splitter application.
 """
 
+import importlib.util
 import pandas as pd
 import os
-from typing import List, Dict, Any
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from operator import itemgetter
+from typing import List, Dict, Any, Iterable
+
+# python-calamine is optional; when installed pandas can use its Rust reader.
+# The 'calamine' engine only exists in pandas 2.2+, so older pandas keeps openpyxl.
+PANDAS_VERSION = tuple(int(part) for part in pd.__version__.split(".")[:2])
+CALAMINE_AVAILABLE = PANDAS_VERSION >= (2, 2) and importlib.util.find_spec("python_calamine") is not None
+
+# Workbook formats streamed with openpyxl; anything else goes through pandas
+OPENPYXL_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# pyarrow is optional; when installed text columns use Arrow string kernels
+STRING_DTYPE = "string[pyarrow]" if importlib.util.find_spec("pyarrow") else "string"
 
 
 class ExcelHandler:
@@ -12,6 +28,10 @@ class ExcelHandler:
 
     def __init__(self):
         self.required_columns = ["Description", "Paid By", "Amount", "Shared With"]
+        self.column_dtypes = {"Description": STRING_DTYPE, "Paid By": STRING_DTYPE, "Shared With": STRING_DTYPE}
+        self.detailed_columns = ["From", "To", "Amount"]
+        self.simplified_columns = ["Person", "Pays_To", "Amount", "Net_Balance"]
+        self.currency_formats = {"Amount": '"$"0.00', "Net_Balance": '+"$"0.00;-"$"0.00;"$"0.00'}
 
     def read_expense_data(self, file_path: str) -> pd.DataFrame:
         """
@@ -34,10 +54,10 @@ class ExcelHandler:
                 raise FileNotFoundError(f"Excel file not found: {file_path}")
 
             # Read Excel file
-            df = pd.read_excel(file_path)
+            df = self._read_sheet(file_path)
 
             # Validate columns
-            self._validate_columns(df)
+            self._validate_columns(df.columns)
 
             # Clean and validate data
             df = self._clean_data(df)
@@ -52,17 +72,63 @@ class ExcelHandler:
         except Exception as e:
             raise Exception(f"Error reading Excel file {file_path}: {str(e)}")
 
-    def _validate_columns(self, df: pd.DataFrame):
+    def _read_sheet(self, file_path: str) -> pd.DataFrame:
+        """
+        Read the active sheet of an Excel file into a DataFrame.
+
+        Uses the calamine engine when python-calamine is installed. Otherwise
+        .xlsx/.xlsm files are streamed with openpyxl in read-only mode, which
+        avoids building the full in-memory cell tree, and other formats (.xls,
+        .ods, .xlsb, ...) fall back to pandas. Only the required columns are kept.
+
+        Args:
+            file_path (str): Path to the Excel file
+
+        Returns:
+            pd.DataFrame: Raw DataFrame of the required columns that are
+                present, with the text columns typed as strings
+
+        Raises:
+            ValueError: If the openpyxl header row lacks required columns
+        """
+        def usecols(col):
+            return col in self.required_columns
+
+        if CALAMINE_AVAILABLE:
+            return pd.read_excel(file_path, engine='calamine', usecols=usecols, dtype=self.column_dtypes)
+
+        if not file_path.lower().endswith(OPENPYXL_EXTENSIONS):
+            return pd.read_excel(file_path, usecols=usecols, dtype=self.column_dtypes)
+
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            ws = wb.active
+
+            # Check the header before parsing any data rows
+            header = list(next(ws.iter_rows(max_row=1, values_only=True), ()))
+            self._validate_columns(header)
+
+            # Bounding the width pads short rows (blank trailing cells) with None
+            # even when the sheet lacks a <dimension> record
+            rows = ws.iter_rows(min_row=2, max_col=len(header), values_only=True)
+            pick_required = itemgetter(*[header.index(col) for col in self.required_columns])
+            df = pd.DataFrame(list(map(pick_required, rows)), columns=self.required_columns)
+        finally:
+            wb.close()
+
+        return df.astype(self.column_dtypes)
+
+    def _validate_columns(self, columns: Iterable[Any]):
         """
         Validate that all required columns are present.
 
         Args:
-            df (pd.DataFrame): DataFrame to validate
+            columns (Iterable): Column names found in the sheet
 
         Raises:
             ValueError: If required columns are missing
         """
-        missing_columns = set(self.required_columns) - set(df.columns)
+        missing_columns = set(self.required_columns) - set(columns)
         if missing_columns:
             raise ValueError(f"Missing required columns: {missing_columns}")
 
@@ -76,26 +142,20 @@ class ExcelHandler:
         Returns:
             pd.DataFrame: Cleaned DataFrame
         """
-        # Make a copy to avoid modifying original
-        df_clean = df.copy()
-
-        # Remove rows with missing essential data
-        df_clean = df_clean.dropna(subset=["Description", "Paid By", "Amount"])
-
         # Convert Amount to numeric, handling any string representations
-        df_clean["Amount"] = pd.to_numeric(df_clean["Amount"], errors='coerce')
+        amounts = pd.to_numeric(df["Amount"], errors='coerce')
 
-        # Remove rows with invalid amounts
-        df_clean = df_clean.dropna(subset=["Amount"])
-        df_clean = df_clean[df_clean["Amount"] > 0]
+        # Keep rows with the essential data and a valid positive amount
+        valid = df["Description"].notna() & df["Paid By"].notna() & amounts.notna() & (amounts > 0)
+        df_clean = df.loc[valid].copy()
+        df_clean["Amount"] = amounts[valid]
 
-        # Clean string fields
-        df_clean["Description"] = df_clean["Description"].astype(str).str.strip()
-        df_clean["Paid By"] = df_clean["Paid By"].astype(str).str.strip()
+        # Clean string fields (already string dtype from the reader)
+        df_clean["Description"] = df_clean["Description"].str.strip()
+        df_clean["Paid By"] = df_clean["Paid By"].str.strip()
 
         # Handle Shared With column - fill NaN with "All"
-        df_clean["Shared With"] = df_clean["Shared With"].fillna("All")
-        df_clean["Shared With"] = df_clean["Shared With"].astype(str).str.strip()
+        df_clean["Shared With"] = df_clean["Shared With"].fillna("All").str.strip()
 
         return df_clean
 
@@ -104,6 +164,8 @@ class ExcelHandler:
                            output_path: str, verbose: bool = False):
         """
         Save settlement data to Excel file with multiple sheets.
+        When there are no settlements at all nothing is written, and an
+        existing file at output_path is removed so it cannot show stale debts.
 
         Args:
             detailed_settlements (List[Dict]): Detailed settlement records
@@ -111,61 +173,152 @@ class ExcelHandler:
             output_path (str): Path for output Excel file
             verbose (bool): Whether to print verbose output
         """
-    def save_settlement_data(self, detailed_settlements: List[Dict[str, Any]],
-                           simplified_settlements: List[Dict[str, Any]],
-                           output_path: str, verbose: bool = False):
+        # Nobody owes anybody, so there is nothing worth writing out
+        if not detailed_settlements:
+            print("No settlements needed - everyone is even! No output file written.")
+            self._remove_stale_outputs([output_path])
+            return
+
+        try:
+            wb = Workbook(write_only=True)
+
+            # Save detailed settlements
+            detailed_sheet = wb.create_sheet('Detailed_Settlements')
+            detailed_sheet.append(self._header_row(detailed_sheet, self.detailed_columns))
+            for settlement in detailed_settlements:
+                detailed_sheet.append(self._data_row(detailed_sheet, settlement, self.detailed_columns))
+
+            # Save simplified settlements
+            simplified_sheet = wb.create_sheet('Simple_Settlements')
+            simplified_sheet.append(self._header_row(simplified_sheet, self.simplified_columns))
+            for settlement in simplified_settlements or []:
+                simplified_sheet.append(self._data_row(simplified_sheet, settlement, self.simplified_columns))
+
+            wb.save(output_path)
+
+            if verbose:
+                print(f"Settlement data saved to: {output_path}")
+                print(f"- Detailed settlements: {len(detailed_settlements)}")
+                print(f"- Simplified settlements: {len([s for s in simplified_settlements if s['Pays_To'] != 'Nobody']) if simplified_settlements else 0} people need to pay")
+            else:
+                print(f"Settlement results saved to '{output_path}' with 2 sheets:")
+                print(f"  📋 Detailed_Settlements: All individual transactions")
+                print(f"  ✨ Simple_Settlements: Optimized payments (fewer transactions)")
+
+        except Exception as e:
+            raise Exception(f"Error saving settlement data to {output_path}: {str(e)}")
+
+    def save_settlement_csv(self, detailed_settlements: List[Dict[str, Any]],
+                            simplified_settlements: List[Dict[str, Any]],
+                            output_path: str, verbose: bool = False):
         """
-        Save settlement data to Excel file with multiple sheets.
+        Save settlement data as two CSV files, a much faster alternative to Excel.
+        For an output path 'results.csv' the files are 'results_detailed.csv'
+        and 'results_simple.csv'. When there are no settlements at all nothing
+        is written and existing files at those paths are removed.
 
         Args:
             detailed_settlements (List[Dict]): Detailed settlement records
             simplified_settlements (List[Dict]): Simplified settlement records
-            output_path (str): Path for output Excel file
+            output_path (str): Path for output CSV file
             verbose (bool): Whether to print verbose output
         """
+        base_path = os.path.splitext(output_path)[0]
+        detailed_path = f"{base_path}_detailed.csv"
+        simplified_path = f"{base_path}_simple.csv"
+
+        # Nobody owes anybody, so there is nothing worth writing out
+        if not detailed_settlements:
+            print("No settlements needed - everyone is even! No output file written.")
+            self._remove_stale_outputs([detailed_path, simplified_path])
+            return
+
         try:
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                # Save detailed settlements
-                if detailed_settlements:
-                    detailed_df = pd.DataFrame(detailed_settlements)
-                    detailed_df.to_excel(writer, sheet_name='Detailed_Settlements', index=False)
-
-                # Save simplified settlements
-                if simplified_settlements:
-                    simplified_df = pd.DataFrame(simplified_settlements)
-                    simplified_df.to_excel(writer, sheet_name='Simple_Settlements', index=False)
-
-                # If no settlements, create empty sheets with headers
-                if not detailed_settlements:
-                    empty_detailed = pd.DataFrame(columns=['From', 'To', 'Amount'])
-                    empty_detailed.to_excel(writer, sheet_name='Detailed_Settlements', index=False)
-
-                if not simplified_settlements:
-                    empty_simplified = pd.DataFrame(columns=['Person', 'Pays_To', 'Amount', 'Net_Balance'])
-                    empty_simplified.to_excel(writer, sheet_name='Simple_Settlements', index=False)
+            pd.DataFrame(detailed_settlements, columns=self.detailed_columns).to_csv(
+                detailed_path, index=False, float_format='%.2f')
+            pd.DataFrame(simplified_settlements, columns=self.simplified_columns).to_csv(
+                simplified_path, index=False, float_format='%.2f')
 
             if verbose:
-                print(f"Settlement data saved to: {output_path}")
-                print(f"- Detailed settlements: {len(detailed_settlements) if detailed_settlements else 0}")
+                print(f"Settlement data saved to: {detailed_path}, {simplified_path}")
+                print(f"- Detailed settlements: {len(detailed_settlements)}")
                 print(f"- Simplified settlements: {len([s for s in simplified_settlements if s['Pays_To'] != 'Nobody']) if simplified_settlements else 0} people need to pay")
             else:
-                if not detailed_settlements and not simplified_settlements:
-                    print("No settlements needed - everyone is even!")
-                else:
-                    print(f"Settlement results saved to '{output_path}' with 2 sheets:")
-                    print(f"  📋 Detailed_Settlements: All individual transactions")
-                    print(f"  ✨ Simple_Settlements: Optimized payments (fewer transactions)")
+                print("Settlement results saved to 2 CSV files:")
+                print(f"  📋 {detailed_path}: All individual transactions")
+                print(f"  ✨ {simplified_path}: Optimized payments (fewer transactions)")
 
         except Exception as e:
             raise Exception(f"Error saving settlement data to {output_path}: {str(e)}")
 
-    def display_data_summary(self, df: pd.DataFrame, people: List[str]):
+    def _remove_stale_outputs(self, paths: List[str]):
+        """
+        Remove settlement files left over from an earlier run.
+
+        Args:
+            paths (List[str]): Output paths that this run did not write
+        """
+        for path in paths:
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    raise Exception(f"Error removing outdated settlement file {path}: {str(e)}")
+                print(f"Removed outdated settlement file: {path}")
+
+    def _header_row(self, worksheet, columns: List[str]) -> List[WriteOnlyCell]:
+        """
+        Build a bold header row for a write-only worksheet.
+
+        Args:
+            worksheet: Write-only worksheet the row will be appended to
+            columns (List[str]): Column names
+
+        Returns:
+            List[WriteOnlyCell]: Styled header cells
+        """
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(worksheet, value=column)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        return header
+
+    def _data_row(self, worksheet, record: Dict[str, Any], columns: List[str]) -> List[Any]:
+        """
+        Build a data row for a write-only worksheet.
+
+        Monetary columns are kept numeric and displayed as currency through
+        the cell number format.
+
+        Args:
+            worksheet: Write-only worksheet the row will be appended to
+            record (Dict): Settlement record
+            columns (List[str]): Column names, in sheet order
+
+        Returns:
+            List: Row values, with currency cells wrapped in WriteOnlyCell
+        """
+        row = []
+        for column in columns:
+            number_format = self.currency_formats.get(column)
+            if number_format is None:
+                row.append(record[column])
+            else:
+                cell = WriteOnlyCell(worksheet, value=record[column])
+                cell.number_format = number_format
+                row.append(cell)
+        return row
+
+    def display_data_summary(self, df: pd.DataFrame, people: List[str], payer_summary: pd.DataFrame):
         """
         Display a summary of the loaded expense data.
 
         Args:
             df (pd.DataFrame): Expense data
             people (List[str]): List of people involved
+            payer_summary (pd.DataFrame): Number of expenses and total amount
+                per payer, as computed by ExpenseSplitter.calculate_balances
         """
         print("\n" + "="*50)
         print("EXPENSE DATA SUMMARY")
@@ -175,9 +328,7 @@ class ExcelHandler:
         print(f"People involved: {', '.join(people)}")
 
         print("\nExpenses by payer:")
-        payer_summary = df.groupby("Paid By")["Amount"].agg(['count', 'sum']).round(2)
-        payer_summary.columns = ['Number of Expenses', 'Total Amount']
-        print(payer_summary)
+        print(payer_summary.round(2))
         print("="*50 + "\n")
 
 
@@ -190,9 +341,12 @@ def read_expenses(file_path: str) -> pd.DataFrame:
 def save_settlements(detailed_settlements: List[Dict[str, Any]],
                    simplified_settlements: List[Dict[str, Any]],
                    output_path: str, verbose: bool = False):
-    """Convenience function to save settlement data."""
+    """Convenience function to save settlement data (as CSV for a .csv output path)."""
     handler = ExcelHandler()
-    handler.save_settlement_data(detailed_settlements, simplified_settlements, output_path, verbose)
+    if output_path.lower().endswith('.csv'):
+        handler.save_settlement_csv(detailed_settlements, simplified_settlements, output_path, verbose)
+    else:
+        handler.save_settlement_data(detailed_settlements, simplified_settlements, output_path, verbose)
 
 
 if __name__ == "__main__":
@@ -2,9 +2,17 @@
 Core logic for splitting expenses and calculating settlements.
 """
 
+import numpy as np
 import pandas as pd
-from collections import defaultdict
-from typing import List, Dict, Any, Tuple
+from operator import attrgetter, itemgetter
+from typing import List, Dict, Any, NamedTuple, Sequence, Tuple
+
+
+class Tx(NamedTuple):
+    """A single optimized payment from a debtor to a creditor."""
+    debtor: str
+    creditor: str
+    amount: float
 
 
 class ExpenseSplitter:
@@ -17,11 +25,19 @@ class ExpenseSplitter:
         Args:
             people (List[str]): List of people involved in expenses
         """
-        self.people = people
-        self.balances = defaultdict(lambda: defaultdict(float))
-        self.final_balances = defaultdict(dict)
+        self.people = tuple(people)
+        self._people_set = frozenset(people)
+        self.person_index = {person: idx for idx, person in enumerate(people)}
+
+        # balances[i, j] is how much people[i] owes people[j]
+        self.balances = np.zeros((len(people), len(people)))
+        self.final_balances = np.zeros((len(people), len(people)))
+        self._transactions_cache = None
+
+        # Number of expenses and total amount per payer, set by calculate_balances
+        self.payer_summary = None
 
-    def parse_shared_with(self, shared_with: str) -> List[str]:
+    def parse_shared_with(self, shared_with: str) -> Sequence[str]:
         """
         Parse the 'Shared With' field to get list of people.
 
@@ -29,21 +45,22 @@ class ExpenseSplitter:
             shared_with (str): Comma-separated names or "All"
 
         Returns:
-            List[str]: List of people who shared the expense
+            Sequence[str]: People who shared the expense. When everyone shared
+                it this is the splitter's own (immutable) people tuple.
         """
         if not shared_with or shared_with.strip().lower() == "all":
-            return self.people.copy()
+            return self.people
 
         # Split by comma and clean up names
         shared_people = [name.strip() for name in shared_with.split(",")]
 
         # Filter to only include known people
-        valid_people = [person for person in shared_people if person in self.people]
+        valid_people = [person for person in shared_people if person in self._people_set]
 
         # If no valid people found, default to all
         if not valid_people:
             print(f"Warning: No valid people found in '{shared_with}', defaulting to all people")
-            return self.people.copy()
+            return self.people
 
         return valid_people
 
@@ -54,26 +71,69 @@ class ExpenseSplitter:
         Args:
             expense_data (pd.DataFrame): DataFrame with expense data
         """
-        # Reset balances
-        self.balances = defaultdict(lambda: defaultdict(float))
-
-        for _, row in expense_data.iterrows():
-            paid_by = row["Paid By"]
-            amount = row["Amount"]
-            shared_with = self.parse_shared_with(row["Shared With"])
-
-            # Skip if payer is not in our people list
-            if paid_by not in self.people:
-                print(f"Warning: '{paid_by}' not in people list, skipping expense: {row['Description']}")
-                continue
-
-            # Calculate amount each person owes
-            amount_per_person = amount / len(shared_with)
+        num_people = len(self.people)
 
-            # Add debt for each person who shared the expense (except the payer)
-            for person in shared_with:
-                if person != paid_by and person in self.people:
-                    self.balances[person][paid_by] += amount_per_person
+        # Reset balances
+        self.balances = np.zeros((num_people, num_people))
+
+        # Factorize payers once; the codes give both the per-payer data summary
+        # and each expense's payer index for the balance accumulation below.
+        # Missing payers get code -1 and are left out of the summary.
+        payer_codes, payer_names = pd.factorize(expense_data["Paid By"], sort=True)
+        amounts = expense_data["Amount"].to_numpy(dtype=np.float64)
+        has_payer = payer_codes >= 0
+        # Totals use pandas' compensated group sum; np.bincount sums naively and
+        # can be a cent off on large sheets
+        self.payer_summary = pd.DataFrame({
+            "Number of Expenses": np.bincount(payer_codes[has_payer], minlength=len(payer_names)),
+            "Total Amount": pd.Series(amounts[has_payer]).groupby(payer_codes[has_payer]).sum().to_numpy()
+        }, index=pd.Index(payer_names, name="Paid By"))
+
+        # Skip expenses whose payer is missing or not in our people list,
+        # reporting them once
+        payer_name_idx = np.array([self.person_index.get(name, -1) for name in payer_names], dtype=np.intp)
+        unknown_payers = self.payer_summary.loc[payer_name_idx < 0, "Number of Expenses"]
+        skipped = [f"'{name}' ({count})" for name, count in unknown_payers.items()]
+        missing_payers = int((~has_payer).sum())
+        if missing_payers:
+            skipped.append(f"'nan' ({missing_payers})")
+        if skipped:
+            print(f"Warning: skipped {unknown_payers.sum() + missing_payers} expenses paid by people not in people list: {', '.join(skipped)}")
+        # Code -1 (missing payer) picks the trailing -1 entry
+        expense_payer_idx = np.append(payer_name_idx, -1)[payer_codes]
+        known_payer = expense_payer_idx >= 0
+        expenses = expense_data.loc[known_payer]
+
+        # Rows shared with everyone don't need their 'Shared With' field parsed
+        shared_col = expenses["Shared With"]
+        shared_with_all = (shared_col.isna() | shared_col.str.strip().str.lower().isin(["", "all"])).to_numpy()
+
+        # Parse each distinct 'Shared With' value once into how many times each
+        # person is listed. Expenses shared with everyone get code -1, which
+        # picks the extra last row listing every person once.
+        shared_codes, distinct_shared = pd.factorize(shared_col.mask(shared_with_all))
+        share_counts = np.zeros((len(distinct_shared) + 1, num_people))
+        share_counts[-1] = 1.0
+        for code, shared_raw in enumerate(distinct_shared):
+            for person in self.parse_shared_with(shared_raw):
+                share_counts[code, self.person_index[person]] += 1
+
+        # Calculate amount each person owes per expense
+        amount_per_person = amounts[known_payer] / share_counts.sum(axis=1)[shared_codes]
+        payer_idx = expense_payer_idx[known_payer]
+
+        # Add each person's debts to every payer. Each listing of a person is
+        # repeated as its own entry and bincount accumulates entries in order,
+        # so totals match splitting the expenses one at a time, even when a
+        # name is listed twice.
+        for person_idx in range(num_people):
+            listings = share_counts[shared_codes, person_idx].astype(np.intp)
+            self.balances[person_idx] = np.bincount(np.repeat(payer_idx, listings),
+                                                    weights=np.repeat(amount_per_person, listings),
+                                                    minlength=num_people)
+
+        # Nobody owes themselves
+        np.fill_diagonal(self.balances, 0.0)
 
     def net_balances(self) -> None:
         """
@@ -81,19 +141,16 @@ class ExpenseSplitter:
         For example, if A owes B $10 and B owes A $6,
         result is A owes B $4.
         """
-        self.final_balances = defaultdict(dict)
-
-        for person1 in self.people:
-            for person2 in self.people:
-                if person1 != person2:
-                    # Calculate net amount person1 owes person2
-                    amount_1_owes_2 = self.balances[person1][person2]
-                    amount_2_owes_1 = self.balances[person2][person1]
+        self._transactions_cache = None
 
-                    net_amount = amount_1_owes_2 - amount_2_owes_1
+        # Net amount each person owes each other person
+        net_amounts = self.balances - self.balances.T
 
-                    if net_amount > 0.01:  # Only record if significant amount
-                        self.final_balances[person1][person2] = round(net_amount, 2)
+        # Only record if significant amount. Round with Python's round(),
+        # which is correctly rounded, unlike np.round at half-cent values.
+        self.final_balances = np.zeros_like(net_amounts)
+        for debtor_idx, creditor_idx in np.argwhere(net_amounts > 0.01):
+            self.final_balances[debtor_idx, creditor_idx] = round(float(net_amounts[debtor_idx, creditor_idx]), 2)
 
     def get_settlements(self) -> List[Dict[str, Any]]:
         """
@@ -104,33 +161,39 @@ class ExpenseSplitter:
         """
         settlements = []
 
-        for debtor, creditors in self.final_balances.items():
-            for creditor, amount in creditors.items():
-                settlements.append({
-                    "From": debtor,
-                    "To": creditor,
-                    "Amount": f"${amount:.2f}"
-                })
+        for debtor_idx, creditor_idx in np.argwhere(self.final_balances > 0):
+            amount = self.final_balances[debtor_idx, creditor_idx]
+            settlements.append({
+                "From": self.people[debtor_idx],
+                "To": self.people[creditor_idx],
+                "Amount": float(amount)
+            })
 
         # Sort settlements by amount (highest first)
-        settlements.sort(key=lambda x: float(x["Amount"][1:]), reverse=True)
+        settlements.sort(key=itemgetter("Amount"), reverse=True)
 
         return settlements
 
-    def get_simplified_settlements(self) -> List[Dict[str, Any]]:
+    def _compute_transactions(self) -> Tuple[List[Tx], Dict[str, float]]:
         """
-        Get simplified settlements that minimize the number of transactions.
-        Uses a greedy algorithm to reduce the number of payments needed.
+        Run the greedy settlement algorithm over the netted balances.
+
+        The result is cached until net_balances() is called again, so the
+        simplified and optimized settlement views share a single run.
 
         Returns:
-            List[Dict]: Simplified settlement list with 'Person', 'Pays_To', 'Amount', 'Net_Balance'
+            Tuple: (transactions, net_balances) where net_balances maps each
+                person to their net position (positive = owed money)
         """
+        if self._transactions_cache is not None:
+            return self._transactions_cache
+
         # Calculate net balance for each person (positive = owed money, negative = owes money)
+        owes = self.final_balances.sum(axis=1)
+        owed = self.final_balances.sum(axis=0)
         net_balances = {}
-        for person in self.people:
-            owes = sum(self.final_balances[person].values())
-            owed = sum(balances.get(person, 0) for balances in self.final_balances.values())
-            net_balances[person] = round(owed - owes, 2)
+        for idx, person in enumerate(self.people):
+            net_balances[person] = round(float(owed[idx] - owes[idx]), 2)
 
         # Separate creditors (positive balance) and debtors (negative balance)
         creditors = [(person, amount) for person, amount in net_balances.items() if amount > 0.01]
@@ -141,7 +204,7 @@ class ExpenseSplitter:
         debtors.sort(key=lambda x: x[1], reverse=True)
 
         # Create simplified transactions
-        simplified_transactions = []
+        transactions: List[Tx] = []
         creditor_idx = 0
         debtor_idx = 0
 
@@ -153,11 +216,7 @@ class ExpenseSplitter:
             transaction_amount = min(credit_amount, debt_amount)
 
             if transaction_amount > 0.01:  # Only record significant amounts
-                simplified_transactions.append({
-                    "From": debtor_name,
-                    "To": creditor_name,
-                    "Amount": round(transaction_amount, 2)
-                })
+                transactions.append(Tx(debtor_name, creditor_name, round(transaction_amount, 2)))
 
             # Update remaining amounts
             creditors[creditor_idx] = (creditor_name, credit_amount - transaction_amount)
@@ -169,12 +228,25 @@ class ExpenseSplitter:
             if debtors[debtor_idx][1] < 0.01:
                 debtor_idx += 1
 
+        self._transactions_cache = (transactions, net_balances)
+        return self._transactions_cache
+
+    def get_simplified_settlements(self) -> List[Dict[str, Any]]:
+        """
+        Get simplified settlements that minimize the number of transactions.
+        Uses a greedy algorithm to reduce the number of payments needed.
+
+        Returns:
+            List[Dict]: Simplified settlement list with 'Person', 'Pays_To', 'Amount', 'Net_Balance'
+        """
+        simplified_transactions, net_balances = self._compute_transactions()
+
         # Create payment summary for each person
         payment_summary = []
 
         for person in self.people:
             # Find who this person needs to pay and how much
-            payments_to_make = [t for t in simplified_transactions if t["From"] == person]
+            payments_to_make = [t for t in simplified_transactions if t.debtor == person]
 
             if payments_to_make:
                 # If person makes multiple payments, combine them or show the main one
@@ -182,19 +254,19 @@ class ExpenseSplitter:
                     payment = payments_to_make[0]
                     payment_summary.append({
                         "Person": person,
-                        "Pays_To": payment["To"],
-                        "Amount": f"${payment['Amount']:.2f}",
-                        "Net_Balance": f"-${payment['Amount']:.2f}"
+                        "Pays_To": payment.creditor,
+                        "Amount": payment.amount,
+                        "Net_Balance": -payment.amount
                     })
                 else:
                     # Multiple payments - show total and main recipient
-                    total_payment = sum(p["Amount"] for p in payments_to_make)
-                    main_recipient = max(payments_to_make, key=lambda x: x["Amount"])["To"]
+                    total_payment = round(sum(p.amount for p in payments_to_make), 2)
+                    main_recipient = max(payments_to_make, key=attrgetter("amount")).creditor
                     payment_summary.append({
                         "Person": person,
                         "Pays_To": f"{main_recipient} (+others)",
-                        "Amount": f"${total_payment:.2f}",
-                        "Net_Balance": f"-${total_payment:.2f}"
+                        "Amount": total_payment,
+                        "Net_Balance": -total_payment
                     })
             else:
                 # Person doesn't need to pay anyone
@@ -203,15 +275,15 @@ class ExpenseSplitter:
                     payment_summary.append({
                         "Person": person,
                         "Pays_To": "Nobody",
-                        "Amount": "$0.00",
-                        "Net_Balance": f"+${net_balance:.2f}"
+                        "Amount": 0.0,
+                        "Net_Balance": net_balance
                     })
                 else:
                     payment_summary.append({
                         "Person": person,
                         "Pays_To": "Nobody",
-                        "Amount": "$0.00",
-                        "Net_Balance": "$0.00"
+                        "Amount": 0.0,
+                        "Net_Balance": 0.0
                     })
 
         return payment_summary
@@ -223,75 +295,38 @@ class ExpenseSplitter:
         Returns:
             Dict: Nested dictionary of balances
         """
+        owes = self.final_balances.sum(axis=1)
+        owed = self.final_balances.sum(axis=0)
+
         summary = {}
-        for person in self.people:
+        for idx, person in enumerate(self.people):
             summary[person] = {
-                "owes": sum(self.final_balances[person].values()),
-                "owed": sum(balances.get(person, 0) for balances in self.final_balances.values())
+                "owes": float(owes[idx]),
+                "owed": float(owed[idx])
             }
         return summary
 
-    def get_optimized_transactions(self) -> List[Dict[str, Any]]:
+    def get_optimized_transactions(self) -> List[Tx]:
         """
-        Compute the optimized list of transactions (debtor → creditor → amount)
+        Compute the optimized list of transactions as Tx(debtor, creditor, amount)
         using the same greedy algorithm as get_simplified_settlements, but
         without aggregating by person.
         """
-        # Calculate net balance for each person (positive = owed money, negative = owes money)
-        net_balances = {}
-        for person in self.people:
-            owes = sum(self.final_balances[person].values())
-            owed = sum(balances.get(person, 0) for balances in self.final_balances.values())
-            net_balances[person] = round(owed - owes, 2)
-
-        # Separate creditors (positive balance) and debtors (negative balance)
-        creditors = [(person, amount) for person, amount in net_balances.items() if amount > 0.01]
-        debtors = [(person, -amount) for person, amount in net_balances.items() if amount < -0.01]
-
-        # Sort by amount (largest first)
-        creditors.sort(key=lambda x: x[1], reverse=True)
-        debtors.sort(key=lambda x: x[1], reverse=True)
-
-        transactions: List[Dict[str, Any]] = []
-        creditor_idx = 0
-        debtor_idx = 0
-
-        while creditor_idx < len(creditors) and debtor_idx < len(debtors):
-            creditor_name, credit_amount = creditors[creditor_idx]
-            debtor_name, debt_amount = debtors[debtor_idx]
-
-            # Determine transaction amount
-            transaction_amount = min(credit_amount, debt_amount)
-
-            if transaction_amount > 0.01:  # Only record significant amounts
-                transactions.append({
-                    "From": debtor_name,
-                    "To": creditor_name,
-                    "Amount": round(transaction_amount, 2)
-                })
-
-            # Update remaining amounts
-            creditors[creditor_idx] = (creditor_name, credit_amount - transaction_amount)
-            debtors[debtor_idx] = (debtor_name, debt_amount - transaction_amount)
-
-            # Move to next creditor/debtor if current one is settled
-            if creditors[creditor_idx][1] < 0.01:
-                creditor_idx += 1
-            if debtors[debtor_idx][1] < 0.01:
-                debtor_idx += 1
-
-        return transactions
+        transactions, _ = self._compute_transactions()
+        return list(transactions)
 
 
-    def process_expenses(self, expense_data: pd.DataFrame) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Dict[str, float]]]:
+    def process_expenses(self, expense_data: pd.DataFrame) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Dict[str, float]], List[Tx]]:
         """
-        Process all expenses and return settlements and summary.
+        Process all expenses and return settlements, summary and the
+        optimized transactions, running the greedy settlement pass once.
 
         Args:
             expense_data (pd.DataFrame): DataFrame with expense data
 
         Returns:
-            Tuple: (detailed_settlements, simplified_settlements, balance_summary)
+            Tuple: (detailed_settlements, simplified_settlements, balance_summary,
+                    optimized_transactions)
         """
         self.calculate_balances(expense_data)
         self.net_balances()
@@ -299,8 +334,9 @@ class ExpenseSplitter:
         detailed_settlements = self.get_settlements()
         simplified_settlements = self.get_simplified_settlements()
         summary = self.get_balance_summary()
+        optimized_transactions = self.get_optimized_transactions()
 
-        return detailed_settlements, simplified_settlements, summary
+        return detailed_settlements, simplified_settlements, summary, optimized_transactions
 
     def print_settlement_summary(self, settlements: List[Dict[str, Any]],
                                summary: Dict[str, Dict[str, float]]):
@@ -322,7 +358,7 @@ class ExpenseSplitter:
         print(f"Total settlements needed: {len(settlements)}\n")
 
         for settlement in settlements:
-            print(f"💰 {settlement['From']} → {settlement['To']}: {settlement['Amount']}")
+            print(f"💰 {settlement['From']} → {settlement['To']}: ${settlement['Amount']:.2f}")
 
         print("\n" + "-"*30)
         print("INDIVIDUAL BALANCES")
@@ -343,7 +379,7 @@ class ExpenseSplitter:
         print("="*50 + "\n")
 
 
-def split_expenses(expense_data: pd.DataFrame, people: List[str], verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Dict[str, float]]]:
+def split_expenses(expense_data: pd.DataFrame, people: List[str], verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Dict[str, float]], List[Tx]]:
     """
     Convenience function to split expenses.
 
@@ -353,15 +389,16 @@ def split_expenses(expense_data: pd.DataFrame, people: List[str], verbose: bool
         verbose (bool): Whether to print detailed output
 
     Returns:
-        Tuple: (detailed_settlements, simplified_settlements, summary)
+        Tuple: (detailed_settlements, simplified_settlements, summary, optimized_transactions)
     """
     splitter = ExpenseSplitter(people)
-    detailed_settlements, simplified_settlements, summary = splitter.process_expenses(expense_data)
+    detailed_settlements, simplified_settlements, summary, optimized_transactions = \
+        splitter.process_expenses(expense_data)
 
     if verbose:
         splitter.print_settlement_summary(detailed_settlements, summary)
 
-    return detailed_settlements, simplified_settlements, summary
+    return detailed_settlements, simplified_settlements, summary, optimized_transactions
 
 
 if __name__ == "__main__":
@@ -377,5 +414,5 @@ if __name__ == "__main__":
     df = pd.DataFrame(sample_data, columns=["Description", "Paid By", "Amount", "Shared With"])
     people = ["Alice", "Bob", "Charlie"]
 
-    detailed_settlements, simplified_settlements, summary = split_expenses(df, people, verbose=True)
+    detailed_settlements, simplified_settlements, summary, optimized_transactions = split_expenses(df, people, verbose=True)
     print("Test completed successfully!")
\ No newline at end of file
@@ -2,84 +2,103 @@
 Main application entry point for expense splitter.
 """
 
+import importlib.util
+import signal
 import sys
 import os
+from itertools import groupby
+from operator import attrgetter
 from typing import Optional
 
-# Import our custom modules
+# Import our custom modules. excel_handler and expense_logic pull in pandas
+# and openpyxl, so they are imported in main() once arguments are valid.
 from args_parser import get_arguments
-from excel_handler import ExcelHandler
-from expense_logic import ExpenseSplitter
+
+# Section separators for console output
+SEPARATOR = "=" * 50
+DASH_SEPARATOR = "-" * 50
+
+# Progress and status messages
+MSG_LOAD = "📊 Loading expense data..."
+MSG_CALC = "🔄 Calculating settlements..."
+MSG_EVEN = "🎉 Everyone is even! No payments needed."
+MSG_SAVE = "💾 Saving settlement data..."
+MSG_DONE = "✅ Processing completed successfully!"
+
+# Line format for a single optimized payment (amount, creditor)
+TX_FMT = "💸 $%.2f → %s"
 
 
 def main():
     """Main application function."""
+    args = None
     try:
         # Parse command line arguments
         args = get_arguments()
 
         if args.verbose:
-            print(f"Processing expenses for: {', '.join(args.people)}")
-            print(f"Reading from: {args.file}")
-            print(f"Output will be saved to: {args.output}")
-            print("-" * 50)
+            sys.stdout.write(
+                f"Processing expenses for: {', '.join(args.people)}\n"
+                f"Reading from: {args.file}\n"
+                f"Output will be saved to: {args.output}\n"
+                f"{DASH_SEPARATOR}\n"
+            )
 
         # Initialize handlers
+        from excel_handler import ExcelHandler
+        from expense_logic import ExpenseSplitter
+
         excel_handler = ExcelHandler()
         expense_splitter = ExpenseSplitter(args.people)
 
         # Read expense data
-        print("📊 Loading expense data...")
+        print(MSG_LOAD)
         expense_data = excel_handler.read_expense_data(args.file)
 
-        # Display data summary if verbose
-        if args.verbose:
-            excel_handler.display_data_summary(expense_data, args.people)
-
         # Process expenses and calculate settlements
-        print("🔄 Calculating settlements...")
-        detailed_settlements, simplified_settlements, summary = expense_splitter.process_expenses(expense_data)
+        print(MSG_CALC)
+        detailed_settlements, simplified_settlements, summary, optimized_transactions = \
+            expense_splitter.process_expenses(expense_data)
+
+        # Display data summary if verbose (computed while processing the expenses)
+        if args.verbose:
+            excel_handler.display_data_summary(expense_data, args.people, expense_splitter.payer_summary)
 
         # Display results
         expense_splitter.print_settlement_summary(detailed_settlements, summary)
 
         # Display simplified settlements
-        print("\n" + "="*50)
+        print("\n" + SEPARATOR)
         print("SIMPLIFIED SETTLEMENT")
-        print("="*50)
-
-        # Use the optimized per-transaction view and print it grouped by payer
-        optimized_transactions = expense_splitter.get_optimized_transactions()
+        print(SEPARATOR)
 
+        # Print the optimized per-transaction view grouped by payer
         if not optimized_transactions:
-            print("🎉 Everyone is even! No payments needed.")
+            print(MSG_EVEN)
         else:
-            from collections import defaultdict
+            # The greedy settlement emits each debtor's payments consecutively,
+            # so they can be grouped in one streaming pass without sorting.
+            # Lines are collected and written to stdout in a single call.
+            lines = []
+            for debtor, txs in groupby(optimized_transactions, key=attrgetter("debtor")):
+                lines.append(f"{debtor} pays:")
+                lines.extend(TX_FMT % (tx.amount, tx.creditor) for tx in txs)
+            sys.stdout.write("\n".join(lines) + "\n")
 
-            grouped = defaultdict(list)
-            for tx in optimized_transactions:
-                grouped[tx["From"]].append(tx)
-
-            for debtor, txs in grouped.items():
-                print(f"{debtor} pays:")
-                for tx in txs:
-                    print(f"💸 ${tx['Amount']:.2f} → {tx['To']}")
-
-        print("="*50 + "\n")
+        print(SEPARATOR + "\n")
 
 
         # Save results
-        print("💾 Saving settlement data...")
-        excel_handler.save_settlement_data(detailed_settlements, simplified_settlements, args.output, args.verbose)
+        print(MSG_SAVE)
+        if args.output.lower().endswith('.csv'):
+            excel_handler.save_settlement_csv(detailed_settlements, simplified_settlements, args.output, args.verbose)
+        else:
+            excel_handler.save_settlement_data(detailed_settlements, simplified_settlements, args.output, args.verbose)
 
-        print("✅ Processing completed successfully!")
+        print(MSG_DONE)
 
         return 0
 
-    except KeyboardInterrupt:
-        print("\n⚠️  Operation cancelled by user.")
-        return 1
-
     except FileNotFoundError as e:
         print(f"❌ File error: {e}")
         return 1
@@ -90,21 +109,26 @@ def main():
 
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
-        if args.verbose if 'args' in locals() else False:
+        if args is not None and args.verbose:
             import traceback
             traceback.print_exc()
         return 1
 
 
+def handle_interrupt(signum, frame):
+    """Exit with an error code when the user presses Ctrl+C."""
+    print("\n⚠️  Operation cancelled by user.")
+    sys.exit(1)
+
+
 def validate_environment():
     """Validate that all required modules are available."""
     required_modules = ['pandas', 'openpyxl']  # openpyxl needed for Excel support
     missing_modules = []
 
     for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
+        # find_spec only locates the module, it doesn't execute it
+        if importlib.util.find_spec(module) is None:
             missing_modules.append(module)
 
     if missing_modules:
@@ -118,10 +142,13 @@ def validate_environment():
 
 
 if __name__ == "__main__":
-    # Validate environment first
-    if not validate_environment():
+    # Validate environment first (set EXPENSE_SKIP_ENV_CHECK=1 to skip, e.g. in scripts)
+    if not os.environ.get("EXPENSE_SKIP_ENV_CHECK") and not validate_environment():
         sys.exit(1)
 
+    # Handle Ctrl+C with a signal handler rather than wrapping all of main()
+    signal.signal(signal.SIGINT, handle_interrupt)
+
     # Run main application
     exit_code = main()
     sys.exit(exit_code)
\ No newline at end of file